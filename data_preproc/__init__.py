@@ -1,13 +1,18 @@
 """Data preprocessing utilities"""
 
-__version__ = "0.1.0"
+import importlib
 
-from data_preproc.core.datasets import load_datasets
-from data_preproc.loaders import load_processor, load_tokenizer
-from data_preproc.mm_plugin import get_mm_plugin, register_mm_plugin
+__version__ = "0.1.0"
 
-# Import processors to register them
-from data_preproc.processors import base, multimodal, hf_filter, image_count_filter, advanced_mapping, regex_transform, image_transform, regex_filter, pipeline, deduplicator, random_sampler, text_toxicity_filter, image_toxicity_filter, sample_packer, image_format_converter, qa_longest_mapping
+# Public API, resolved on first access so that importing the package (e.g. for
+# the CLI) does not pull in transformers/torch up front
+_LAZY_ATTRS = {
+    "load_datasets": "data_preproc.core.datasets",
+    "load_tokenizer": "data_preproc.loaders",
+    "load_processor": "data_preproc.loaders",
+    "get_mm_plugin": "data_preproc.mm_plugin",
+    "register_mm_plugin": "data_preproc.mm_plugin",
+}
 
 __all__ = [
     "load_datasets",
@@ -15,4 +20,12 @@ __all__ = [
     "load_processor",
     "get_mm_plugin",
     "register_mm_plugin",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
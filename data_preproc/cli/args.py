@@ -1,7 +1,8 @@
 """Module for data preprocessing CLI command arguments."""
 
-from dataclasses import dataclass, field
-from typing import Optional
+import argparse
+from dataclasses import dataclass, field, fields, MISSING
+from typing import List, Optional, Union, get_args, get_origin
 
 
 @dataclass
@@ -30,4 +31,48 @@ class PreprocessCliArgs:
         metadata={
             "help": "Global limit on number of samples to process (enables streaming mode)"
         },
-    )
\ No newline at end of file
+    )
+
+def _str_to_bool(value: str) -> bool:
+    if value.lower() in ("yes", "true", "t", "y", "1"):
+        return True
+    if value.lower() in ("no", "false", "f", "n", "0"):
+        return False
+    raise argparse.ArgumentTypeError(f"Truthy value expected: got {value}")
+
+
+def parse_preprocess_cli_args(argv: Optional[List[str]] = None) -> PreprocessCliArgs:
+    """Parse `PreprocessCliArgs` fields from argv, ignoring any other arguments.
+
+    Builds the same flags `transformers.HfArgumentParser` would for this flat
+    dataclass (`--name`/`--name-with-dashes`, bare boolean flags), without
+    importing transformers.
+    """
+    parser = argparse.ArgumentParser(allow_abbrev=False)
+    for cli_field in fields(PreprocessCliArgs):
+        field_type = cli_field.type
+        # Optional[X] -> X
+        if get_origin(field_type) is Union:
+            field_type = next(arg for arg in get_args(field_type) if arg is not type(None))
+
+        names = [f"--{cli_field.name}"]
+        if "_" in cli_field.name:
+            names.append(f"--{cli_field.name.replace('_', '-')}")
+        kwargs = {
+            "dest": cli_field.name,
+            "default": None if cli_field.default is MISSING else cli_field.default,
+            "help": cli_field.metadata.get("help"),
+        }
+        if field_type is bool:
+            kwargs["type"] = _str_to_bool
+            # As in HfArgumentParser, Optional[bool] fields defaulting to None need a value
+            if kwargs["default"] is not None:
+                kwargs.update(nargs="?", const=True)
+        else:
+            kwargs["type"] = field_type
+        parser.add_argument(*names, **kwargs)
+        if field_type is bool and cli_field.default is True:
+            parser.add_argument(f"--no_{cli_field.name}", dest=cli_field.name, action="store_false")
+
+    namespace, _ = parser.parse_known_args(argv)
+    return PreprocessCliArgs(**vars(namespace))
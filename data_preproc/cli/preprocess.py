@@ -5,13 +5,10 @@ import sys
 from typing import List
 from typing import Union
 
-import fire
-import transformers
 from dotenv import load_dotenv
 
-from data_preproc.cli.args import PreprocessCliArgs
+from data_preproc.cli.args import PreprocessCliArgs, parse_preprocess_cli_args
 from data_preproc.cli.config import load_cfg
-from data_preproc.core.datasets import load_datasets
 from data_preproc.utils.dict import DictDefault
 from data_preproc.utils.logging import get_logger
 
@@ -29,6 +26,8 @@ def do_preprocess(cfg: DictDefault, cli_args: PreprocessCliArgs) -> None:
         cli_args: Preprocessing-specific CLI arguments.
     """
     import logging
+
+    from data_preproc.core.datasets import load_datasets
     
     # Configure logging format to be cleaner for processor output
     # Default to WARNING to suppress most logs, but we'll selectively enable INFO for our processors
@@ -95,16 +94,15 @@ def do_cli(
     """
     parsed_cfg = load_cfg(config, **kwargs)
     parsed_cfg.is_preprocess = True
-    parser = transformers.HfArgumentParser(PreprocessCliArgs)
-    parsed_cli_args, _ = parser.parse_args_into_dataclasses(
-        return_remaining_strings=True
-    )
+    parsed_cli_args = parse_preprocess_cli_args()
 
     do_preprocess(parsed_cfg, parsed_cli_args)
 
 
 def main():
     """Main entry point."""
+    import fire
+
     load_dotenv()
     # Normalize short flag aliases before Fire parses arguments
     # Map `-c value` and `-c=value` to `--config value`
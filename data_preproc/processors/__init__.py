@@ -1,6 +1,7 @@
 """Dataset processors for different formats."""
 
 from typing import Dict, Type, Any, Optional, Union, List
+import importlib
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
@@ -13,6 +14,27 @@ PROCESSORS: Dict[str, Type["DatasetProcessor"]] = {}
 # Global registry for named processor instances
 PROCESSOR_INSTANCES: Dict[str, "DatasetProcessor"] = {}
 
+# Built-in processor modules; they register themselves on import. Several import
+# transformers/torch at module level, so they are loaded on first registry lookup
+# rather than when the package is imported.
+BUILTIN_PROCESSOR_MODULES = [
+    "base", "multimodal", "hf_filter", "image_count_filter", "advanced_mapping",
+    "regex_transform", "image_transform", "regex_filter", "pipeline", "deduplicator",
+    "random_sampler", "text_toxicity_filter", "image_toxicity_filter", "sample_packer",
+    "image_format_converter", "qa_longest_mapping",
+]
+_builtin_processors_loaded = False
+
+
+def _load_builtin_processors():
+    """Import the built-in processor modules once so they register themselves."""
+    global _builtin_processors_loaded
+    if _builtin_processors_loaded:
+        return
+    for module_name in BUILTIN_PROCESSOR_MODULES:
+        importlib.import_module(f"{__name__}.{module_name}")
+    _builtin_processors_loaded = True
+
 
 @dataclass 
 class ProcessorCondition:
@@ -145,6 +167,11 @@ class DatasetProcessor(ABC):
 
 def register_processor(name: str, processor_class: Type[DatasetProcessor]):
     """Register a dataset processor class."""
+    # Built-ins load lazily, possibly after user code registered its own class
+    # under the same name; that class must keep taking precedence
+    if name in PROCESSORS and processor_class.__module__.startswith(f"{__name__}."):
+        LOG.debug(f"Keeping already registered processor class: {name}")
+        return
     PROCESSORS[name] = processor_class
     LOG.debug(f"Registered processor class: {name}")
 
@@ -157,6 +184,7 @@ def register_processor_instance(name: str, processor_instance: DatasetProcessor)
 
 def get_processor_class(processor_type: str) -> Type[DatasetProcessor]:
     """Get a processor class by type."""
+    _load_builtin_processors()
     if processor_type not in PROCESSORS:
         raise ValueError(f"Unknown processor type: {processor_type}. Available: {list(PROCESSORS.keys())}")
     return PROCESSORS[processor_type]
@@ -250,6 +278,7 @@ def get_processor(name_or_config: Union[str, Dict[str, Any]], config: Optional[D
 
 def list_processors() -> list[str]:
     """List all registered processor types."""
+    _load_builtin_processors()
     return list(PROCESSORS.keys())
 
 
@@ -1,17 +1,24 @@
 """Image format converter processor to ensure HuggingFace compatibility."""
 
 import logging
-from typing import Dict, Any, List, Optional
+import os
+import stat
+from typing import Dict, Any, List, Optional, Union
 from io import BytesIO
-import base64
+import binascii
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 
 from . import DatasetProcessor, register_processor
 
 LOG = logging.getLogger(__name__)
 
 try:
+    import PIL
     from PIL import Image as PILImage
     HAS_PIL = True
+    # Pillow-SIMD is a drop-in replacement that publishes ".postN" versions
+    PIL_BACKEND = "Pillow-SIMD" if "post" in PIL.__version__ else "Pillow"
 except ImportError:
     HAS_PIL = False
     LOG.warning("PIL not available for image processing")
@@ -23,6 +30,86 @@ except ImportError:
     HAS_DATASETS_IMAGE = False
     LOG.warning("datasets.Image not available")
 
+# io_uring bindings (optional, Linux only)
+try:
+    import liburing
+    HAS_LIBURING = True
+except ImportError:
+    HAS_LIBURING = False
+
+
+# Leading bytes of PNG and JPEG files, used to spot payloads that are already decoded
+_IMAGE_MAGIC = (b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff')
+_IMAGE_MAGIC_STR = tuple(magic.decode('latin-1') for magic in _IMAGE_MAGIC)
+
+
+def _read_file(path: str) -> bytes:
+    """Read an encoded image file as is."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _read_files_io_uring(paths: List[str], queue_depth: int = 64) -> Dict[str, bytes]:
+    """Read whole files through one io_uring, keeping up to `queue_depth` reads in flight.
+
+    Paths that cannot be opened, are not regular files or come back short are
+    left out of the result for the caller to read and report.
+    """
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(queue_depth, ring)
+    results = {}
+
+    try:
+        for start in range(0, len(paths), queue_depth):
+            pending = []
+            fds = []
+            try:
+                for path in paths[start:start + queue_depth]:
+                    try:
+                        fd = os.open(path, os.O_RDONLY)
+                    except OSError:
+                        continue
+                    fds.append(fd)
+
+                    file_stat = os.fstat(fd)
+                    if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size == 0:
+                        continue
+
+                    buffer = bytearray(file_stat.st_size)
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    liburing.io_uring_prep_read(sqe, fd, buffer, 0)
+                    sqe.user_data = len(pending)
+                    pending.append((path, buffer))
+
+                liburing.io_uring_submit(ring)
+                for _ in range(len(pending)):
+                    liburing.io_uring_wait_cqe(ring, cqe)
+                    entry = cqe[0]
+                    path, buffer = pending[entry.user_data]
+                    if entry.res == len(buffer):
+                        results[path] = bytes(buffer)
+                    liburing.io_uring_cqe_seen(ring, entry)
+            finally:
+                for fd in fds:
+                    os.close(fd)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+    return results
+
+
+def _b64decode_fast(data: Union[str, bytes]) -> bytes:
+    """Decode base64 image data with binascii, passing through raw image payloads."""
+    if isinstance(data, str):
+        # Raw binary that was stored as a latin-1 string
+        if data.startswith(_IMAGE_MAGIC_STR):
+            return data.encode('latin-1')
+        data = data.encode('ascii')
+    elif data.startswith(_IMAGE_MAGIC):
+        return data
+    return binascii.a2b_base64(data)
+
 
 class ImageFormatConverterProcessor(DatasetProcessor):
     """Converts image fields to HuggingFace-compatible format.
@@ -50,18 +137,54 @@ class ImageFormatConverterProcessor(DatasetProcessor):
         self.image_fields = config.get("image_fields", ["image"])
         self.target_format = config.get("target_format", "hf_image")  # "hf_image" or "bytes"
         self.skip_on_error = config.get("skip_on_error", True)
+        self.batch_size = config.get("batch_size", 256)
+        self.num_proc = config.get("num_proc", os.cpu_count())
+        # Threads per worker that read path-only images ahead of conversion
+        self.io_threads = config.get("io_threads", 4)
+        self.io_backend = config.get("io_backend", "threads")  # "threads" or "io_uring"
+        # Threads per worker for hf_image conversion; PIL releases the GIL while decoding
+        self.decode_threads = config.get("decode_threads", 1)
+        # Fully decode bytes inputs instead of only checking their headers
+        self.force_decode = config.get("force_decode", False)
+
+        # Format used when a PIL image has no original bytes to pass through
+        self.reencode_format = config.get("reencode_format", "png").lower()  # "png" or "jpeg"
+
+        if self.reencode_format not in ["png", "jpeg"]:
+            raise ValueError(f"Invalid reencode_format: {self.reencode_format}. Must be 'png' or 'jpeg'")
+
+        if self.io_backend not in ["threads", "io_uring"]:
+            raise ValueError(f"Invalid io_backend: {self.io_backend}. Must be 'threads' or 'io_uring'")
+
+        if self.io_backend == "io_uring" and not HAS_LIBURING:
+            LOG.warning("liburing not available, falling back to thread pool reads")
+            self.io_backend = "threads"
+
+        # Input type -> converter used by _to_pil, looked up once per value
+        self._pil_dispatch = {
+            dict: self._pil_from_dict,
+            bytes: self._pil_from_bytes,
+            str: self._pil_from_str,
+        }
+
+        cpu_count = os.cpu_count() or 1
+        if self.decode_threads > 1 and (self.num_proc or 1) * self.decode_threads > cpu_count:
+            LOG.warning(
+                f"num_proc ({self.num_proc}) x decode_threads ({self.decode_threads}) exceeds "
+                f"{cpu_count} CPUs, decode threads will contend for cores"
+            )
 
         LOG.info(f"Initialized ImageFormatConverter for fields: {self.image_fields}")
         LOG.info(f"Target format: {self.target_format}")
+        LOG.info(f"Image backend: {PIL_BACKEND} {PIL.__version__}")
 
     def apply_to_dataset(self, dataset):
         """Apply image format conversion to the dataset."""
-        from datasets import Features, Value
-
         initial_count = len(dataset)
         LOG.info(f"🔄 ImageFormatConverter: Processing {initial_count} examples")
         LOG.info(f"  Image fields: {self.image_fields}")
         LOG.info(f"  Target format: {self.target_format}")
+        LOG.info(f"  Batch size: {self.batch_size}, num_proc: {self.num_proc}")
 
         # First, check current feature types
         for field in self.image_fields:
@@ -76,15 +199,27 @@ class ImageFormatConverterProcessor(DatasetProcessor):
                     LOG.warning(f"Field '{field}' not found in dataset columns")
                     continue
 
+                if isinstance(dataset.features[field], Image):
+                    LOG.info(f"'{field}' is already of Image type, skipping")
+                    continue
+
                 try:
                     # Cast the column to Image type
                     LOG.info(f"Converting '{field}' to HuggingFace Image type...")
 
-                    # First convert dict/bytes to PIL Images
-                    dataset = dataset.map(
-                        lambda ex: self._convert_to_pil(ex, field),
-                        desc=f"Converting {field} to PIL"
-                    )
+                    # Binary columns and {'bytes', 'path'} structs are cast directly;
+                    # anything else (base64 strings, path-only rows) is decoded first
+                    if self._can_cast_directly(dataset, field):
+                        LOG.info(f"  '{field}' holds raw image bytes, casting without decode pass")
+                    else:
+                        dataset = dataset.map(
+                            self._convert_batch_to_pil,
+                            batched=True,
+                            batch_size=self.batch_size,
+                            num_proc=self.num_proc,
+                            fn_kwargs={"field": field},
+                            desc=f"Preparing {field} for Image cast"
+                        )
 
                     # Then cast to Image feature type
                     new_features = dataset.features.copy()
@@ -99,9 +234,37 @@ class ImageFormatConverterProcessor(DatasetProcessor):
                         raise
 
         else:
+            from datasets import Value
+
+            # Read Image columns undecoded so their stored bytes pass through untouched
+            bytes_features = None
+            for field in self.image_fields:
+                if isinstance(dataset.features.get(field), Image):
+                    dataset = dataset.cast_column(field, Image(decode=False))
+                    bytes_features = dataset.features.copy()
+
+            # Explicit features must describe every converted field, not just the Image ones
+            if bytes_features is not None:
+                for field in self.image_fields:
+                    if field in bytes_features:
+                        bytes_features[field] = Value("binary")
+
+            # The common single-field case maps the per-field converter directly
+            if len(self.image_fields) == 1:
+                convert_fn = self._convert_field_batch_to_bytes
+                fn_kwargs = {"field": self.image_fields[0]}
+            else:
+                convert_fn = self._convert_batch_to_bytes
+                fn_kwargs = None
+
             # Convert to raw bytes format
             dataset = dataset.map(
-                self._convert_to_bytes,
+                convert_fn,
+                batched=True,
+                batch_size=self.batch_size,
+                num_proc=self.num_proc,
+                fn_kwargs=fn_kwargs,
+                features=bytes_features,
                 desc="Converting images to bytes"
             )
 
@@ -110,113 +273,257 @@ class ImageFormatConverterProcessor(DatasetProcessor):
 
         return dataset
 
+    @staticmethod
+    def _can_cast_directly(dataset, field: str) -> bool:
+        """Check whether `Image()` can be cast onto the column without a decode pass."""
+        from datasets import Value
+
+        binary_dtypes = ("binary", "large_binary")
+        feature = dataset.features[field]
+
+        if isinstance(feature, Value):
+            return feature.dtype in binary_dtypes
+
+        if isinstance(feature, dict):
+            bytes_feature = feature.get("bytes")
+            if not isinstance(bytes_feature, Value) or bytes_feature.dtype not in binary_dtypes:
+                return False
+            # Path-only rows are fine too: the decode pass would store them as
+            # {'bytes': None, 'path': ...} references all the same
+            return not set(feature) - {"bytes", "path"}
+
+        return False
+
+    def _convert_batch_to_pil(self, batch: Dict[str, List[Any]], field: str) -> Dict[str, List[Any]]:
+        """Convert a batch of image values in `field` to a form the Image feature can store."""
+        if field not in batch:
+            return batch
+
+        to_pil = self._to_pil
+        values = batch[field]
+        if self.decode_threads > 1 and len(values) > 1:
+            with ThreadPoolExecutor(max_workers=self.decode_threads) as executor:
+                batch[field] = list(executor.map(to_pil, values, repeat(field)))
+        else:
+            batch[field] = [to_pil(image_data, field) for image_data in values]
+        return batch
+
+    def _convert_batch_to_bytes(self, batch: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        """Convert a batch of image fields to raw bytes."""
+        for field in self.image_fields:
+            batch = self._convert_field_batch_to_bytes(batch, field)
+
+        return batch
+
+    def _convert_field_batch_to_bytes(self, batch: Dict[str, List[Any]], field: str) -> Dict[str, List[Any]]:
+        """Convert a batch of image values in a single field to raw bytes."""
+        if field not in batch:
+            return batch
+
+        to_bytes = self._to_bytes
+        prefetched = self._prefetch_paths(batch[field])
+        batch[field] = [to_bytes(image_data, field, prefetched) for image_data in batch[field]]
+        return batch
+
+    def _prefetch_paths(self, values: List[Any]) -> Dict[str, bytes]:
+        """Read the files behind path-only image dicts concurrently."""
+        paths = list(dict.fromkeys(
+            value['path'] for value in values
+            if isinstance(value, dict) and value.get('bytes') is None and value.get('path')
+        ))
+        if len(paths) < 2:
+            return {}
+
+        if self.io_backend == "io_uring":
+            try:
+                return _read_files_io_uring(paths)
+            except OSError as e:
+                LOG.warning(f"io_uring batch read failed, falling back to thread pool: {e}")
+
+        if self.io_threads <= 1:
+            return {}
+
+        prefetched = {}
+        with ThreadPoolExecutor(max_workers=min(self.io_threads, len(paths))) as executor:
+            futures = [executor.submit(_read_file, path) for path in paths]
+            for path, future in zip(paths, futures):
+                try:
+                    prefetched[path] = future.result()
+                except OSError as e:
+                    # Left for _to_bytes to retry and report
+                    LOG.debug(f"Failed to prefetch image '{path}': {e}")
+
+        return prefetched
+
     def _convert_to_pil(self, example: Dict[str, Any], field: str) -> Dict[str, Any]:
         """Convert image field to PIL Image."""
         if field not in example:
             return example
 
-        image_data = example[field]
+        example[field] = self._to_pil(example[field], field)
+        return example
+
+    def _convert_to_bytes(self, example: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert image fields to raw bytes."""
+        for field in self.image_fields:
+            if field not in example:
+                continue
+
+            example[field] = self._to_bytes(example[field], field)
 
+        return example
+
+    def _to_pil(self, image_data: Any, field: str) -> Any:
+        """Convert a single image value to a form the Image feature can store.
+
+        Encoded bytes are only validated from their header and kept as a
+        ``{'bytes', 'path'}`` dict, since the Image feature stores bytes rather
+        than pixels. PIL Images and unsupported types are returned as is, and
+        so is the value on failure.
+        """
+        if image_data is None:
+            return image_data
+
+        handler = self._pil_dispatch.get(type(image_data))
+        if handler is None:
+            # PIL Images are usually format subclasses (PngImageFile, ...) and pass through
+            if isinstance(image_data, PILImage.Image):
+                return image_data
+            # Other subclasses miss the exact-type lookup
+            handler = next(
+                (h for input_type, h in self._pil_dispatch.items() if isinstance(image_data, input_type)),
+                None,
+            )
+            if handler is None:
+                return image_data
+
+        try:
+            return handler(image_data, field)
+        except Exception as e:
+            LOG.warning(f"Error converting image in field '{field}': {e}")
+            if not self.skip_on_error:
+                raise
+
+        return image_data
+
+    def _pil_from_dict(self, image_data: Dict[str, Any], field: str) -> Any:
+        """Handle the dict format {'bytes': ..., 'path': ...}."""
+        bytes_data = image_data.get('bytes')
+        if bytes_data is not None:
+            # Handle base64 encoded string
+            if isinstance(bytes_data, str):
+                bytes_data = _b64decode_fast(bytes_data)
+
+            if isinstance(bytes_data, bytes):
+                return self._verified_image_dict(bytes_data)
+            LOG.warning(f"Unexpected bytes type: {type(bytes_data)}")
+
+        elif image_data.get('path'):
+            # Load from path
+            return PILImage.open(image_data['path'])
+        else:
+            LOG.warning(f"Dict image format not recognized: {image_data.keys()}")
+
+        return image_data
+
+    def _pil_from_bytes(self, image_data: bytes, field: str) -> Any:
+        """Handle raw encoded bytes."""
+        return self._verified_image_dict(image_data)
+
+    def _pil_from_str(self, image_data: str, field: str) -> Any:
+        """Handle a base64 encoded string."""
+        try:
+            return self._verified_image_dict(_b64decode_fast(image_data))
+        except:
+            LOG.warning(f"Failed to decode base64 string for field '{field}'")
+            return image_data
+
+    def _verified_image_dict(self, bytes_data: bytes) -> Dict[str, Any]:
+        """Check encoded image bytes and wrap them for the Image feature.
+
+        Only the container is validated unless ``force_decode`` is set, in which
+        case the pixels are decoded (and discarded) to catch truncated data.
+        """
+        image = PILImage.open(BytesIO(bytes_data))
+        if self.force_decode:
+            image.load()
+        else:
+            image.verify()
+        return {'bytes': bytes_data, 'path': None}
+
+    def _to_bytes(self, image_data: Any, field: str, prefetched: Optional[Dict[str, bytes]] = None) -> Any:
+        """Convert a single image value to raw bytes, returning it unchanged on failure."""
         try:
             # Handle different input formats
             if image_data is None:
-                return example
+                return image_data
 
-            # If already a PIL Image, return as is
+            # Handle PIL Image
             if isinstance(image_data, PILImage.Image):
-                return example
+                return self._encode_pil(image_data)
 
-            # Handle dict format {'bytes': ..., 'path': ...}
+            # Handle dict format
             if isinstance(image_data, dict):
-                if 'bytes' in image_data:
-                    bytes_data = image_data['bytes']
-
+                bytes_data = image_data.get('bytes')
+                if bytes_data is not None:
                     # Handle base64 encoded string
                     if isinstance(bytes_data, str):
-                        bytes_data = base64.b64decode(bytes_data)
+                        return _b64decode_fast(bytes_data)
+                    return bytes_data
 
-                    # Convert bytes to PIL Image
-                    if isinstance(bytes_data, bytes):
-                        pil_image = PILImage.open(BytesIO(bytes_data))
-                        example[field] = pil_image
-                    else:
-                        LOG.warning(f"Unexpected bytes type: {type(bytes_data)}")
-
-                elif 'path' in image_data and image_data['path']:
-                    # Load from path
-                    pil_image = PILImage.open(image_data['path'])
-                    example[field] = pil_image
-                else:
-                    LOG.warning(f"Dict image format not recognized: {image_data.keys()}")
+                path = image_data.get('path')
+                if path:
+                    if prefetched and path in prefetched:
+                        return prefetched[path]
+                    # Read the encoded file as is
+                    return _read_file(path)
 
-            # Handle raw bytes
+            # Already bytes, keep as is
             elif isinstance(image_data, bytes):
-                pil_image = PILImage.open(BytesIO(image_data))
-                example[field] = pil_image
+                return image_data
 
             # Handle base64 string
             elif isinstance(image_data, str):
                 try:
-                    bytes_data = base64.b64decode(image_data)
-                    pil_image = PILImage.open(BytesIO(bytes_data))
-                    example[field] = pil_image
+                    return _b64decode_fast(image_data)
                 except:
                     LOG.warning(f"Failed to decode base64 string for field '{field}'")
 
         except Exception as e:
-            LOG.warning(f"Error converting image in field '{field}': {e}")
+            LOG.warning(f"Error converting image to bytes in field '{field}': {e}")
             if not self.skip_on_error:
                 raise
 
-        return example
+        return image_data
 
-    def _convert_to_bytes(self, example: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert image fields to raw bytes."""
-        for field in self.image_fields:
-            if field not in example:
-                continue
+    def _encode_pil(self, image: "PILImage.Image") -> bytes:
+        """Encode a PIL Image to bytes, preferring its original encoded payload."""
+        original = self._original_bytes(image)
+        if original is not None:
+            return original
 
-            image_data = example[field]
+        # Avoid the default zlib level 6 pass: fast PNG, or high-quality JPEG if requested
+        buffer = BytesIO()
+        if self.reencode_format == "jpeg" and image.mode in ("RGB", "L"):
+            image.save(buffer, format='JPEG', quality=95)
+        else:
+            image.save(buffer, format='PNG', optimize=False, compress_level=1)
 
-            try:
-                # Handle different input formats
-                if image_data is None:
-                    continue
+        return buffer.getvalue()
 
-                # Handle PIL Image
-                if isinstance(image_data, PILImage.Image):
-                    buffer = BytesIO()
-                    image_data.save(buffer, format='PNG')
-                    example[field] = buffer.getvalue()
-
-                # Handle dict format
-                elif isinstance(image_data, dict):
-                    if 'bytes' in image_data:
-                        bytes_data = image_data['bytes']
-
-                        # Handle base64 encoded string
-                        if isinstance(bytes_data, str):
-                            example[field] = base64.b64decode(bytes_data)
-                        else:
-                            example[field] = bytes_data
-
-                # Already bytes, keep as is
-                elif isinstance(image_data, bytes):
-                    pass
-
-                # Handle base64 string
-                elif isinstance(image_data, str):
-                    try:
-                        example[field] = base64.b64decode(image_data)
-                    except:
-                        LOG.warning(f"Failed to decode base64 string for field '{field}'")
+    @staticmethod
+    def _original_bytes(image: "PILImage.Image") -> Optional[bytes]:
+        """Return the in-memory bytes an opened PIL Image was read from, if it is unmodified.
 
-            except Exception as e:
-                LOG.warning(f"Error converting image to bytes in field '{field}': {e}")
-                if not self.skip_on_error:
-                    raise
+        Only images whose pixels have not been loaded yet qualify: loading (which
+        every in-place edit such as ``thumbnail`` or ``paste`` triggers) clears
+        ``tile``, and files on disk are never re-read since they may not match.
+        """
+        fp = getattr(image, 'fp', None)
+        if image.format and image.tile and isinstance(fp, BytesIO):
+            return fp.getvalue()
 
-        return example
+        return None
 
     def process_example(self, example: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process a single example (for compatibility)."""
@@ -3,13 +3,23 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from . import DatasetProcessor, register_processor
 
 
 LOG = logging.getLogger(__name__)
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Building the length array dominates either way; numpy's argmax only breaks
+# even with max() at around 100-128 entries
+NUMPY_MIN_EXPLANATIONS = 128
+
 
 class LongestExplanationMappingProcessor(DatasetProcessor):
     """Select the QA entry with the longest explanation and format the output."""
@@ -24,13 +34,107 @@ class LongestExplanationMappingProcessor(DatasetProcessor):
         self.solution_field = config.get("solution_field", "solution")
         self.keep_unmapped = config.get("keep_unmapped", True)
         self.remove_source_fields = config.get("remove_source_fields", False)
+        self.batch_size = config.get("batch_size", 1000)
+        self.num_proc = config.get("num_proc")
+        self._fields_to_remove = self._removed_fields()
+
+    def apply_to_dataset(self, dataset):
+        """Apply the mapping with a batched ``datasets.map`` instead of row by row."""
+        from datasets import Features, Value
+
+        initial_count = len(dataset)
+        LOG.info(f"🔄 LongestExplanationMapping: Processing {initial_count} examples")
+
+        # Explicit output types, since a batch holding only passthrough rows would
+        # otherwise get its all-None problem/solution columns typed as null
+        features = Features({
+            column: dataset.features[column]
+            for column in self._output_columns(dataset.column_names)
+            if column not in (self.problem_field, self.solution_field)
+        })
+        features[self.problem_field] = Value("string")
+        features[self.solution_field] = Value("string")
+
+        dataset = dataset.map(
+            self.process_batch,
+            batched=True,
+            batch_size=self.batch_size,
+            num_proc=self.num_proc,
+            remove_columns=dataset.column_names,
+            features=features,
+            desc="Selecting longest explanations",
+        )
+
+        if initial_count and not len(dataset):
+            raise ValueError(
+                "All examples filtered out by longest_explanation_mapping processor. "
+                "Check processor configuration and input data."
+            )
+
+        LOG.info(f"✅ LongestExplanationMapping complete: {len(dataset)}/{initial_count} examples kept")
+        return dataset
+
+    def process_batch(self, batch: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        """Process a batch of rows, dropping the ones that are filtered out.
+
+        Rows that don't meet the processor condition pass through with their
+        original columns, so when that can happen the output keeps every input
+        column (mapped rows get None for the ones they dropped and passthrough
+        rows get None for the problem/solution fields).
+        """
+        columns = list(batch)
+        num_rows = len(batch[columns[0]]) if columns else 0
+
+        output_columns = self._output_columns(columns)
+        output: Dict[str, List[Any]] = {column: [] for column in output_columns}
+
+        process_example = self.process_example
+        should_process = self.should_process
+        for i in range(num_rows):
+            example = {column: batch[column][i] for column in columns}
+            # Rows that don't meet the processor condition pass through unchanged
+            result = process_example(example) if should_process(example) else example
+            if result is None:
+                continue
+            for column in output_columns:
+                output[column].append(result.get(column))
+
+        return output
+
+    def _output_columns(self, columns: List[str]) -> List[str]:
+        """Columns produced for a batch with the given input columns."""
+        # Every batch must yield the same columns, so decide up front rather than per row
+        may_pass_through = bool(self.condition) or any(
+            column not in columns for column in self.get_required_columns()
+        )
+        if may_pass_through:
+            output_columns = list(columns)
+        elif self.keep_unmapped:
+            output_columns = [column for column in columns if column not in self._fields_to_remove]
+        else:
+            output_columns = []
+        for column in (self.problem_field, self.solution_field):
+            if column not in output_columns:
+                output_columns.append(column)
+        return output_columns
 
     def process_example(self, example: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Bind per-row lookups to locals once; this runs for every row of the dataset
+        as_list = self._as_list
+        question_field = self.question_field
+        explanation_field = self.explanation_field
+        answer_field = self.answer_field
+        problem_field = self.problem_field
+        solution_field = self.solution_field
+        format_solution = self._format_solution
+        keep = self.keep_unmapped
+        fields_to_remove = self._fields_to_remove
+
         try:
             source = self._get_source_container(example)
-            questions = self._as_list(source.get(self.question_field))
-            explanations = self._as_list(source.get(self.explanation_field))
-            answers = self._as_list(source.get(self.answer_field))
+            questions = as_list(source.get(question_field))
+            explanations = as_list(source.get(explanation_field))
+            answers = as_list(source.get(answer_field))
 
             if not questions or not explanations or not answers:
                 LOG.debug(
@@ -68,27 +172,31 @@ class LongestExplanationMappingProcessor(DatasetProcessor):
                 )
                 return None
 
-            result = example.copy() if self.keep_unmapped else {}
-            result[self.problem_field] = question
-            result[self.solution_field] = self._format_solution(explanation, answer)
+            # Update the row in place; datasets.map already treats the returned dict as a new row
+            result = example if keep else {}
+            result[problem_field] = question
+            result[solution_field] = format_solution(explanation, answer)
 
-            if self.remove_source_fields:
-                if self.qa_pairs_field:
-                    result.pop(self.qa_pairs_field, None)
-                else:
-                    for field in {self.question_field, self.explanation_field, self.answer_field}:
-                        result.pop(field, None)
+            for field in fields_to_remove:
+                result.pop(field, None)
 
             return result
 
         except Exception as exc:  # pragma: no cover - defensive logging
             LOG.warning("Error in longest explanation mapping: %s", exc)
             LOG.debug("Example keys: %s", list(example.keys()))
-            return example if self.keep_unmapped else None
+            return example if keep else None
 
     def get_required_columns(self) -> List[str]:
         return [self.qa_pairs_field]
 
+    def _removed_fields(self) -> Tuple[str, ...]:
+        if not self.remove_source_fields:
+            return ()
+        if self.qa_pairs_field:
+            return (self.qa_pairs_field,)
+        return (self.question_field, self.explanation_field, self.answer_field)
+
     @staticmethod
     def _as_list(value: Any) -> List[Any]:
         if value is None:
@@ -99,24 +207,33 @@ class LongestExplanationMappingProcessor(DatasetProcessor):
 
     @staticmethod
     def _have_matching_lengths(*sequences: List[Any]) -> bool:
-        lengths = {len(seq) for seq in sequences}
-        return len(lengths) == 1
+        n = len(sequences[0])
+        return all(len(seq) == n for seq in sequences[1:])
 
     @staticmethod
     def _select_longest_index(explanations: List[Any]) -> Optional[int]:
-        max_length = -1
-        max_index = None
+        if all(item is None for item in explanations):
+            return None
 
-        for idx, item in enumerate(explanations):
-            if item is None:
-                continue
-            text = str(item)
-            current_length = len(text)
-            if current_length > max_length:
-                max_length = current_length
-                max_index = idx
+        if HAS_NUMPY and len(explanations) > NUMPY_MIN_EXPLANATIONS:
+            return LongestExplanationMappingProcessor._select_longest_index_np(explanations)
 
-        return max_index
+        lengths = [
+            -1 if item is None else len(item if isinstance(item, str) else str(item))
+            for item in explanations
+        ]
+        # max() keeps the first index on ties
+        return max(range(len(lengths)), key=lengths.__getitem__)
+
+    @staticmethod
+    def _select_longest_index_np(explanations: List[Any]) -> int:
+        lengths = np.fromiter(
+            (-1 if item is None else len(item if isinstance(item, str) else str(item)) for item in explanations),
+            dtype=np.int64,
+            count=len(explanations),
+        )
+        # argmax keeps the first index on ties, matching the pure-Python path
+        return int(lengths.argmax())
 
     @staticmethod
     def _format_solution(explanation: str, answer: str) -> str:
@@ -1,7 +1,13 @@
 """Data preprocessing utilities."""
 
-from .compute_device import ComputeDeviceUtils
-
 __all__ = [
     "ComputeDeviceUtils",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # compute_device imports torch, so it is only loaded when actually used
+    if name == "ComputeDeviceUtils":
+        from .compute_device import ComputeDeviceUtils
+        return ComputeDeviceUtils
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
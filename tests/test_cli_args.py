@@ -0,0 +1,36 @@
+"""Test preprocessing CLI argument parsing."""
+
+import pytest
+
+from data_preproc.cli.args import PreprocessCliArgs, parse_preprocess_cli_args
+
+
+class TestParsePreprocessCliArgs:
+    """Test cases for parse_preprocess_cli_args."""
+
+    def test_defaults(self):
+        """Test no arguments yields the dataclass defaults."""
+        assert parse_preprocess_cli_args([]) == PreprocessCliArgs()
+
+    def test_flags_and_values(self):
+        """Test bare boolean flags, explicit values and dashed aliases."""
+        args = parse_preprocess_cli_args(
+            ["--debug", "--download", "no", "--iterable", "true", "--debug-num-examples", "3", "--limit", "5"]
+        )
+
+        assert args.debug is True
+        assert args.download is False
+        assert args.iterable is True
+        assert args.debug_num_examples == 3
+        assert args.limit == 5
+
+    def test_ignores_unknown_arguments(self):
+        """Test config and override arguments meant for Fire are left alone."""
+        args = parse_preprocess_cli_args(["config.yaml", "--config", "x.yaml", "--no_download", "--other=1"])
+
+        assert args.download is False
+        assert args.debug is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
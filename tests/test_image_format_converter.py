@@ -0,0 +1,355 @@
+"""Test image format converter processor functionality."""
+
+import base64
+from io import BytesIO
+
+import pytest
+from datasets import Dataset
+from PIL import Image as PILImage
+
+from data_preproc.processors.image_format_converter import ImageFormatConverterProcessor, _b64decode_fast
+
+
+def _png_bytes(color=(255, 0, 0), size=(8, 8)):
+    """Encode a small solid-colour image as PNG bytes."""
+    buffer = BytesIO()
+    PILImage.new("RGB", size, color=color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestImageFormatConverter:
+    """Test cases for ImageFormatConverterProcessor."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.png = _png_bytes()
+
+    def test_default_configuration(self):
+        """Test processor with default configuration."""
+        processor = ImageFormatConverterProcessor({})
+
+        assert processor.image_fields == ["image"]
+        assert processor.target_format == "hf_image"
+        assert processor.batch_size == 256
+        assert processor.num_proc is None or processor.num_proc >= 1
+
+    def test_convert_batch_to_pil(self):
+        """Test batched conversion keeps validated bytes without decoding."""
+        processor = ImageFormatConverterProcessor({"num_proc": 1})
+        batch = {
+            "image": [
+                {"bytes": self.png, "path": None},
+                self.png,
+                base64.b64encode(self.png).decode("ascii"),
+                None,
+            ],
+            "id": [1, 2, 3, 4],
+        }
+
+        result = processor._convert_batch_to_pil(batch, field="image")
+
+        assert result["id"] == [1, 2, 3, 4]
+        for image in result["image"][:3]:
+            assert image == {"bytes": self.png, "path": None}
+        assert result["image"][3] is None
+
+    def test_convert_batch_to_pil_decode_threads(self):
+        """Test threaded conversion returns results in input order."""
+        images = [_png_bytes(color=(i, 0, 0)) for i in range(6)]
+        processor = ImageFormatConverterProcessor({"num_proc": 1, "decode_threads": 3})
+
+        result = processor._convert_batch_to_pil({"image": list(images)}, field="image")
+
+        assert result["image"] == [{"bytes": image, "path": None} for image in images]
+
+    def test_convert_batch_to_bytes(self):
+        """Test batched conversion of mixed inputs to raw bytes."""
+        processor = ImageFormatConverterProcessor({"target_format": "bytes", "num_proc": 1})
+        batch = {
+            "image": [
+                {"bytes": self.png, "path": None},
+                base64.b64encode(self.png).decode("ascii"),
+                self.png,
+            ]
+        }
+
+        result = processor._convert_batch_to_bytes(batch)
+
+        assert result["image"] == [self.png, self.png, self.png]
+
+    def test_apply_to_dataset_hf_image(self):
+        """Test dataset conversion to the HuggingFace Image feature."""
+        from datasets import Image
+
+        dataset = Dataset.from_list([
+            {"image": {"bytes": self.png, "path": None}, "id": i} for i in range(5)
+        ])
+        processor = ImageFormatConverterProcessor({"num_proc": 1, "batch_size": 2})
+
+        result = processor.apply_to_dataset(dataset)
+
+        assert len(result) == 5
+        assert isinstance(result.features["image"], Image)
+        assert result[0]["image"].size == (8, 8)
+        assert result["id"] == list(range(5))
+
+    def test_can_cast_directly(self, tmp_path):
+        """Test detection of columns that Image() can store without decoding."""
+        image_path = tmp_path / "image.png"
+        image_path.write_bytes(self.png)
+
+        bytes_struct = Dataset.from_list([{"image": {"bytes": self.png, "path": None}}])
+        binary = Dataset.from_list([{"image": self.png}])
+        base64_strings = Dataset.from_list([{"image": base64.b64encode(self.png).decode("ascii")}])
+        path_only = Dataset.from_list([
+            {"image": {"bytes": self.png, "path": None}},
+            {"image": {"bytes": None, "path": str(image_path)}},
+        ])
+
+        assert ImageFormatConverterProcessor._can_cast_directly(bytes_struct, "image")
+        assert ImageFormatConverterProcessor._can_cast_directly(binary, "image")
+        assert not ImageFormatConverterProcessor._can_cast_directly(base64_strings, "image")
+        assert ImageFormatConverterProcessor._can_cast_directly(path_only, "image")
+
+    def test_apply_to_dataset_path_only_hf_image(self, tmp_path):
+        """Test path-only rows cast directly and still decode from their path."""
+        from datasets import Image
+
+        image_path = tmp_path / "image.png"
+        image_path.write_bytes(self.png)
+        dataset = Dataset.from_list([
+            {"image": {"bytes": self.png, "path": None}},
+            {"image": {"bytes": None, "path": str(image_path)}},
+        ])
+        processor = ImageFormatConverterProcessor({"num_proc": 1})
+
+        result = processor.apply_to_dataset(dataset)
+
+        assert isinstance(result.features["image"], Image)
+        assert [image.size for image in result["image"]] == [(8, 8), (8, 8)]
+
+    def test_apply_to_dataset_base64_hf_image(self):
+        """Test base64 columns still go through the decode pass."""
+        from datasets import Image
+
+        dataset = Dataset.from_list([
+            {"image": base64.b64encode(self.png).decode("ascii")} for _ in range(3)
+        ])
+        processor = ImageFormatConverterProcessor({"num_proc": 1})
+
+        result = processor.apply_to_dataset(dataset)
+
+        assert isinstance(result.features["image"], Image)
+        assert result[0]["image"].size == (8, 8)
+
+    def test_apply_to_dataset_bytes(self):
+        """Test dataset conversion to raw bytes."""
+        dataset = Dataset.from_list([
+            {"image": base64.b64encode(self.png).decode("ascii")} for _ in range(3)
+        ])
+        processor = ImageFormatConverterProcessor({"target_format": "bytes", "num_proc": 1})
+
+        result = processor.apply_to_dataset(dataset)
+
+        assert result["image"] == [self.png] * 3
+
+    def test_apply_to_dataset_bytes_multiple_fields(self):
+        """Test bytes conversion covers every configured image field."""
+        encoded = base64.b64encode(self.png).decode("ascii")
+        dataset = Dataset.from_list([{"image": encoded, "thumbnail": encoded, "id": 1}])
+        processor = ImageFormatConverterProcessor({
+            "target_format": "bytes",
+            "image_fields": ["image", "thumbnail"],
+            "num_proc": 1,
+        })
+
+        result = processor.apply_to_dataset(dataset)
+
+        assert result[0] == {"image": self.png, "thumbnail": self.png, "id": 1}
+
+    def test_apply_to_dataset_bytes_mixed_field_types(self):
+        """Test bytes conversion when an Image column sits next to a bytes/path struct column."""
+        from datasets import Image
+
+        dataset = Dataset.from_list([
+            {"a": {"bytes": self.png, "path": None}, "b": {"bytes": self.png, "path": None}, "id": 1}
+        ])
+        dataset = dataset.cast_column("a", Image())
+        processor = ImageFormatConverterProcessor({
+            "target_format": "bytes",
+            "image_fields": ["a", "b"],
+            "num_proc": 1,
+        })
+
+        result = processor.apply_to_dataset(dataset)
+
+        assert result[0] == {"a": self.png, "b": self.png, "id": 1}
+
+    def test_apply_to_dataset_bytes_from_image_feature(self):
+        """Test Image-typed columns yield their stored bytes without re-encoding."""
+        from datasets import Image
+
+        dataset = Dataset.from_list([{"image": {"bytes": self.png, "path": None}}])
+        dataset = dataset.cast_column("image", Image())
+        processor = ImageFormatConverterProcessor({"target_format": "bytes", "num_proc": 1})
+
+        result = processor.apply_to_dataset(dataset)
+
+        assert result["image"] == [self.png]
+
+    def test_convert_batch_to_bytes_prefetches_paths(self, tmp_path):
+        """Test path-only images are read ahead and converted to their file bytes."""
+        other = _png_bytes(color=(0, 0, 255))
+        paths = []
+        for i, data in enumerate([self.png, other, self.png]):
+            path = tmp_path / f"image_{i}.png"
+            path.write_bytes(data)
+            paths.append(str(path))
+        processor = ImageFormatConverterProcessor({"target_format": "bytes", "io_threads": 2})
+        batch = {"image": [{"bytes": None, "path": path} for path in paths]}
+
+        assert set(processor._prefetch_paths(batch["image"])) == set(paths)
+
+        result = processor._convert_batch_to_bytes(batch)
+
+        assert result["image"] == [self.png, other, self.png]
+
+    def test_prefetch_paths_io_uring(self, tmp_path):
+        """Test the io_uring backend reads the same bytes as the thread pool."""
+        from data_preproc.processors import image_format_converter
+
+        if not image_format_converter.HAS_LIBURING:
+            pytest.skip("liburing not available")
+
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"image_{i}.png"
+            path.write_bytes(_png_bytes(color=(i, i, i)))
+            paths.append(str(path))
+        values = [{"bytes": None, "path": path} for path in paths + [str(tmp_path / "missing.png")]]
+        processor = ImageFormatConverterProcessor({"target_format": "bytes", "io_backend": "io_uring"})
+
+        prefetched = processor._prefetch_paths(values)
+
+        assert prefetched == {path: open(path, "rb").read() for path in paths}
+
+    def test_invalid_io_backend(self):
+        """Test invalid io_backend is rejected."""
+        with pytest.raises(ValueError, match="Invalid io_backend"):
+            ImageFormatConverterProcessor({"io_backend": "aio"})
+
+    def test_pil_bytes_passthrough(self):
+        """Test opened PIL Images reuse their original bytes."""
+        processor = ImageFormatConverterProcessor({"target_format": "bytes"})
+        image = PILImage.open(BytesIO(self.png))
+
+        assert processor._to_bytes(image, "image") == self.png
+
+    def test_pil_in_place_edits_reencoded(self, tmp_path):
+        """Test edited PIL Images are re-encoded rather than returning the original bytes."""
+        image_path = tmp_path / "image.png"
+        image_path.write_bytes(self.png)
+        processor = ImageFormatConverterProcessor({"target_format": "bytes"})
+
+        from_file = PILImage.open(image_path)
+        from_file.thumbnail((4, 4))
+        from_memory = PILImage.open(BytesIO(self.png))
+        from_memory.thumbnail((4, 4))
+
+        for image in (from_file, from_memory):
+            encoded = processor._to_bytes(image, "image")
+            assert PILImage.open(BytesIO(encoded)).size == (4, 4)
+
+    def test_pil_reencode_format(self):
+        """Test live PIL Images are re-encoded in the configured format."""
+        image = PILImage.new("RGB", (8, 8), color=(0, 255, 0))
+
+        png_processor = ImageFormatConverterProcessor({"target_format": "bytes"})
+        jpeg_processor = ImageFormatConverterProcessor({"target_format": "bytes", "reencode_format": "jpeg"})
+
+        assert PILImage.open(BytesIO(png_processor._to_bytes(image, "image"))).format == "PNG"
+        assert PILImage.open(BytesIO(jpeg_processor._to_bytes(image, "image"))).format == "JPEG"
+
+        # Modes JPEG cannot store fall back to PNG
+        rgba = PILImage.new("RGBA", (8, 8))
+        assert PILImage.open(BytesIO(jpeg_processor._to_bytes(rgba, "image"))).format == "PNG"
+
+    def test_reencode_png(self):
+        """Test images without original bytes are re-encoded as fast PNG."""
+        processor = ImageFormatConverterProcessor({"target_format": "bytes"})
+        small = PILImage.new("RGB", (4, 4), color=(1, 2, 3))
+
+        encoded = processor._to_bytes(small, "image")
+
+        decoded = PILImage.open(BytesIO(encoded))
+        assert decoded.size == (4, 4)
+        assert decoded.getpixel((0, 0)) == (1, 2, 3)
+        buffer = BytesIO()
+        small.save(buffer, format="PNG", optimize=False, compress_level=1)
+        assert encoded == buffer.getvalue()
+
+    def test_invalid_reencode_format(self):
+        """Test invalid reencode_format is rejected."""
+        with pytest.raises(ValueError, match="Invalid reencode_format"):
+            ImageFormatConverterProcessor({"reencode_format": "webp"})
+
+    def test_process_example(self):
+        """Test single-example compatibility path."""
+        processor = ImageFormatConverterProcessor({})
+
+        result = processor.process_example({"image": self.png})
+
+        assert result["image"] == {"bytes": self.png, "path": None}
+
+    def test_to_pil_passthrough_types(self):
+        """Test PIL Images and unsupported types are returned unchanged."""
+        processor = ImageFormatConverterProcessor({"skip_on_error": False})
+        image = PILImage.open(BytesIO(self.png))
+
+        assert processor._to_pil(image, "image") is image
+        assert processor._to_pil(42, "image") == 42
+
+    def test_convert_path_only_dict(self, tmp_path):
+        """Test dicts without bytes are loaded from their path."""
+        image_path = tmp_path / "image.png"
+        image_path.write_bytes(self.png)
+        processor = ImageFormatConverterProcessor({})
+
+        image = processor._to_pil({"bytes": None, "path": str(image_path)}, "image")
+
+        assert isinstance(image, PILImage.Image)
+        assert image.size == (8, 8)
+
+    def test_force_decode(self):
+        """Test force_decode rejects truncated images that pass header verification."""
+        buffer = BytesIO()
+        PILImage.effect_noise((64, 64), 100).convert("RGB").save(buffer, format="JPEG")
+        truncated = buffer.getvalue()[:-200]
+
+        verify_only = ImageFormatConverterProcessor({"skip_on_error": False})
+        full_decode = ImageFormatConverterProcessor({"skip_on_error": False, "force_decode": True})
+
+        assert verify_only._to_pil(truncated, "image") == {"bytes": truncated, "path": None}
+        with pytest.raises(OSError):
+            full_decode._to_pil(truncated, "image")
+        assert full_decode._to_pil(self.png, "image") == {"bytes": self.png, "path": None}
+
+    def test_b64decode_fast(self):
+        """Test base64 decoding and passthrough of already-binary payloads."""
+        encoded = base64.b64encode(self.png)
+
+        assert _b64decode_fast(encoded.decode("ascii")) == self.png
+        assert _b64decode_fast(encoded) == self.png
+        assert _b64decode_fast(self.png) == self.png
+        assert _b64decode_fast(self.png.decode("latin-1")) == self.png
+
+    def test_skip_on_error_disabled(self):
+        """Test that conversion errors propagate when skip_on_error is False."""
+        processor = ImageFormatConverterProcessor({"skip_on_error": False})
+
+        with pytest.raises(Exception):
+            processor._convert_batch_to_pil({"image": [b"not an image"]}, field="image")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,32 @@
+"""Test dataset processor registration."""
+
+import sys
+
+import pytest
+
+import data_preproc.processors as processors
+from data_preproc.processors import get_processor_class, register_processor
+from data_preproc.processors.regex_filter import RegexFilterProcessor
+
+
+class TestProcessorRegistry:
+    """Test cases for the processor registry."""
+
+    def test_user_class_overrides_lazily_loaded_builtin(self, monkeypatch):
+        """Test a class registered before the built-ins load keeps its name."""
+        monkeypatch.setattr(processors, "PROCESSORS", {})
+        monkeypatch.setattr(processors, "_builtin_processors_loaded", False)
+        # Drop the built-in module so loading the built-ins registers it again
+        monkeypatch.delitem(sys.modules, "data_preproc.processors.regex_filter")
+
+        class MyRegexFilter(RegexFilterProcessor):
+            pass
+
+        register_processor("regex_filter", MyRegexFilter)
+
+        assert get_processor_class("regex_filter") is MyRegexFilter
+        assert "hf_filter" in processors.list_processors()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
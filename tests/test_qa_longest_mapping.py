@@ -0,0 +1,164 @@
+"""Test longest explanation mapping processor functionality."""
+
+import pytest
+from datasets import Dataset
+
+from data_preproc.processors.qa_longest_mapping import LongestExplanationMappingProcessor
+
+
+class TestLongestExplanationMapping:
+    """Test cases for LongestExplanationMappingProcessor."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.example = {
+            "id": 1,
+            "qa_pairs": {
+                "question": ["Q1", "Q2", "Q3"],
+                "explanation": ["short", "the longest explanation", "medium one"],
+                "answer": ["A1", "A2", "A3"],
+            },
+        }
+
+    def test_selects_longest_explanation(self):
+        """Test the QA entry with the longest explanation is selected."""
+        processor = LongestExplanationMappingProcessor({})
+
+        result = processor.process_example(dict(self.example))
+
+        assert result["problem"] == "Q2"
+        assert result["solution"] == "the longest explanation\n\nThe answer is \\boxed{A2}."
+        assert result["id"] == 1
+        assert "qa_pairs" in result
+
+    def test_keep_unmapped_updates_in_place(self):
+        """Test the input row is updated in place when keep_unmapped is set."""
+        processor = LongestExplanationMappingProcessor({})
+        example = dict(self.example)
+
+        result = processor.process_example(example)
+
+        assert result is example
+
+    def test_drop_unmapped(self):
+        """Test only the mapped fields are returned when keep_unmapped is False."""
+        processor = LongestExplanationMappingProcessor({"keep_unmapped": False})
+
+        result = processor.process_example(dict(self.example))
+
+        assert set(result) == {"problem", "solution"}
+
+    def test_remove_source_fields(self):
+        """Test the qa_pairs field is dropped when requested."""
+        processor = LongestExplanationMappingProcessor({"remove_source_fields": True})
+
+        result = processor.process_example(dict(self.example))
+
+        assert "qa_pairs" not in result
+        assert result["id"] == 1
+
+    def test_length_mismatch_filtered(self):
+        """Test examples with mismatched QA list lengths are filtered."""
+        processor = LongestExplanationMappingProcessor({})
+        example = {"qa_pairs": {"question": ["Q1", "Q2"], "explanation": ["E1"], "answer": ["A1", "A2"]}}
+
+        assert processor.process_example(example) is None
+
+    def test_missing_qa_pairs_filtered(self):
+        """Test examples without QA pairs are filtered."""
+        processor = LongestExplanationMappingProcessor({})
+
+        assert processor.process_example({"id": 1}) is None
+
+    def test_process_batch(self):
+        """Test batched processing maps valid rows and drops filtered ones."""
+        processor = LongestExplanationMappingProcessor({})
+        invalid = {"question": ["Q1"], "explanation": ["E1", "E2"], "answer": ["A1"]}
+        batch = {
+            "id": [1, 2],
+            "qa_pairs": [self.example["qa_pairs"], invalid],
+        }
+
+        result = processor.process_batch(batch)
+
+        assert result["id"] == [1]
+        assert result["problem"] == ["Q2"]
+        assert result["solution"] == ["the longest explanation\n\nThe answer is \\boxed{A2}."]
+
+    def test_apply_to_dataset(self):
+        """Test dataset-level application through batched map."""
+        invalid = {"id": 2, "qa_pairs": {"question": ["Q"], "explanation": [], "answer": ["A"]}}
+        dataset = Dataset.from_list([self.example, invalid, self.example])
+        processor = LongestExplanationMappingProcessor({"remove_source_fields": True, "batch_size": 2})
+
+        result = processor.apply_to_dataset(dataset)
+
+        assert len(result) == 2
+        assert result.column_names == ["id", "problem", "solution"]
+        assert result["problem"] == ["Q2", "Q2"]
+
+    def test_process_batch_passthrough_drop_unmapped(self):
+        """Test rows failing the condition keep their columns when keep_unmapped is False."""
+        processor = LongestExplanationMappingProcessor(
+            {"keep_unmapped": False, "condition": {"field_equals": {"id": 1}}}
+        )
+        batch = {"id": [1, 2], "qa_pairs": [self.example["qa_pairs"]] * 2}
+
+        result = processor.process_batch(batch)
+
+        assert result["id"] == [None, 2]
+        assert result["qa_pairs"] == [None, self.example["qa_pairs"]]
+        assert result["problem"] == ["Q2", None]
+
+    def test_process_batch_passthrough_remove_source_fields(self):
+        """Test rows failing the condition keep qa_pairs when source fields are removed."""
+        processor = LongestExplanationMappingProcessor(
+            {"remove_source_fields": True, "condition": {"field_equals": {"id": 1}}}
+        )
+        batch = {"id": [1, 2], "qa_pairs": [self.example["qa_pairs"]] * 2}
+
+        result = processor.process_batch(batch)
+
+        assert result["id"] == [1, 2]
+        assert result["qa_pairs"] == [None, self.example["qa_pairs"]]
+        assert result["solution"][1] is None
+
+    def test_apply_to_dataset_passthrough_first_batches(self):
+        """Test mapped rows after a run of passthrough rows keep string-typed output."""
+        rows = [{"id": i, "qa_pairs": self.example["qa_pairs"]} for i in range(3000)]
+        processor = LongestExplanationMappingProcessor({"condition": {"field_equals": {"id": 2999}}})
+
+        result = processor.apply_to_dataset(Dataset.from_list(rows))
+
+        assert result.features["problem"].dtype == "string"
+        assert result[0]["problem"] is None
+        assert result[2999]["problem"] == "Q2"
+
+    def test_apply_to_dataset_all_filtered(self):
+        """Test an error is raised when every example is filtered out."""
+        invalid = {"id": 2, "qa_pairs": {"question": ["Q"], "explanation": [], "answer": ["A"]}}
+        processor = LongestExplanationMappingProcessor({})
+
+        with pytest.raises(ValueError, match="All examples filtered out"):
+            processor.apply_to_dataset(Dataset.from_list([invalid, invalid]))
+
+    def test_select_longest_index(self):
+        """Test longest index selection skips None entries."""
+        select = LongestExplanationMappingProcessor._select_longest_index
+
+        assert select(["a", "abc", "ab"]) == 1
+        assert select([None, "a", None]) == 1
+        assert select(["ab", "cd"]) == 0
+        assert select([None, None]) is None
+        assert select([]) is None
+
+    def test_select_longest_index_long_list(self):
+        """Test the numpy path for long lists matches the pure-Python result."""
+        explanations = ["x" * (i % 7) for i in range(200)] + [None, "y" * 6]
+
+        assert LongestExplanationMappingProcessor._select_longest_index(explanations) == 6
+        assert LongestExplanationMappingProcessor._select_longest_index([None] * 200) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])